@@ -1,12 +1,26 @@
-from flask import Flask
+import logging
+import os
+
+from flask import Flask, request
 from flask_cors import CORS
+from pymongo.errors import PyMongoError
+from werkzeug.exceptions import HTTPException
+from . import db
+from .errors import INTERNAL_SERVER_ERROR, error_response
+from .json_provider import OrjsonProvider
 from .routes.health import blp
 from .routes.devices import blp_devices
 from flask_smorest import Api
 
 
+logger = logging.getLogger(__name__)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.url_map.strict_slashes = False
+# Cap request bodies so JSON parsing cost is bounded; device payloads are tiny.
+app.config["MAX_CONTENT_LENGTH"] = 1 << 20
 CORS(app, resources={r"/*": {"origins": "*"}})
 app.config["API_TITLE"] = "My Flask API"
 app.config["API_VERSION"] = "v1"
@@ -19,3 +33,30 @@ app.config["OPENAPI_SWAGGER_UI_URL"] = "https://cdn.jsdelivr.net/npm/swagger-ui-
 api = Api(app)
 api.register_blueprint(blp)
 api.register_blueprint(blp_devices)
+
+
+# Centralized error handlers, so route handlers carry no per-request
+# try/except frame on the happy path and every failure leaves the API in
+# the standard error shape.
+@app.errorhandler(PyMongoError)
+def _handle_pymongo_error(exc):
+    logger.exception("database error handling %s %s", request.method, request.path)
+    return error_response(500, INTERNAL_SERVER_ERROR)
+
+
+@app.errorhandler(Exception)
+def _handle_unexpected_error(exc):
+    # Leave HTTPExceptions (404 routing misses, 405s, ...) to their own
+    # handlers instead of collapsing them into 500s.
+    if isinstance(exc, HTTPException):
+        return exc
+    logger.exception("unhandled error handling %s %s", request.method, request.path)
+    return error_response(500, INTERNAL_SERVER_ERROR)
+
+# Probe Mongo from a background thread rather than blocking worker boot on a
+# synchronous round-trip; health checks read the cached result. Index
+# creation is kicked off at boot too, so the first request never pays for
+# it. Both are skipped under tests, where pymongo is mocked per-case.
+if os.getenv("FLASK_ENV") != "testing":  # pragma: no cover - not exercised by the mocked suite
+    db.ensure_indexes()
+    db.start_background_ping()
@@ -0,0 +1,72 @@
+import functools
+import json
+import os
+from typing import NamedTuple
+
+# Local-development defaults; deployments override via env or config.json.
+DEFAULT_URI = "mongodb://localhost:27017"
+DEFAULT_DB = "device_inventory"
+DEFAULT_COLLECTION = "devices"
+
+
+class MongoSettings(NamedTuple):
+    """Resolved MongoDB connection settings (immutable, C-backed tuple)."""
+
+    uri: str
+    database: str
+    collection: str
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path, mtime_ns):
+    # mtime_ns keys the cache entry: an untouched file is opened and parsed at
+    # most once per process, while a rewritten file gets a fresh parse.
+    with open(path, "r") as fh:
+        return json.load(fh)
+
+
+def _load_json_file(path):
+    """Parse the config file through the mtime-keyed cache; {} on any failure."""
+    try:
+        return _load_json_cached(path, os.stat(path).st_mtime_ns)
+    except (OSError, ValueError):
+        return {}
+
+
+def _find_config() -> dict:
+    """
+    Locate and parse the optional config.json with the fewest syscalls:
+    CONFIG_PATH is consulted once, and each default candidate costs a single
+    stat (which also keys the parse cache) instead of an isfile probe followed
+    by a second stat. Returns {} when no usable file exists.
+    """
+    explicit = os.getenv("CONFIG_PATH")
+    if explicit:
+        return _load_json_file(explicit)
+    cwd = os.getcwd()
+    for cand in (os.path.join(cwd, "Backend", "config.json"), os.path.join(cwd, "config.json")):
+        try:
+            st = os.stat(cand)
+        except OSError:
+            continue
+        try:
+            return _load_json_cached(cand, st.st_mtime_ns)
+        except (OSError, ValueError):
+            return {}
+    return {}
+
+
+# PUBLIC_INTERFACE
+def load_mongo_settings() -> MongoSettings:
+    """
+    Resolve MongoDB settings with env vars taking precedence over the optional
+    config.json ("uri" / "database" / "collection" keys), falling back to
+    local-development defaults. The file is cached by (path, mtime), so
+    repeated calls cost a stat rather than a re-open and re-parse.
+    """
+    file_cfg = _find_config()
+    return MongoSettings(
+        uri=os.getenv("MONGODB_URI", file_cfg.get("uri", DEFAULT_URI)),
+        database=os.getenv("MONGODB_DB", file_cfg.get("database", DEFAULT_DB)),
+        collection=os.getenv("MONGODB_COLLECTION", file_cfg.get("collection", DEFAULT_COLLECTION)),
+    )
@@ -0,0 +1,217 @@
+import atexit
+import logging
+import os
+import threading
+import time
+
+import pymongo
+from bson.codec_options import CodecOptions
+
+from .config import load_mongo_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class _NoIdDict(dict):
+    """
+    BSON document class that silently drops "_id" while decoding, so every
+    read path yields JSON-ready documents even where a projection was missed.
+    Queries still pass {"_id": 0} where they can, which also saves the bytes
+    on the wire; this codec layer is the belt to that suspender.
+    """
+
+    def __setitem__(self, key, value):
+        if key == "_id":
+            return
+        dict.__setitem__(self, key, value)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer tuning knob from the environment, falling back on bad values."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# Connection-pool and timeout tuning, read once at import. Explicit timeouts
+# bound tail latency when Mongo is slow or unreachable instead of hanging the
+# worker on the driver defaults.
+MONGO_MAX_POOL_SIZE = _env_int("MONGODB_MAX_POOL_SIZE", 200)
+MONGO_MIN_POOL_SIZE = _env_int("MONGODB_MIN_POOL_SIZE", 10)
+MONGO_MAX_CONNECTING = _env_int("MONGODB_MAX_CONNECTING", 8)
+MONGO_MAX_IDLE_TIME_MS = _env_int("MONGODB_MAX_IDLE_TIME_MS", 60000)
+MONGO_CONNECT_TIMEOUT_MS = _env_int("MONGODB_CONNECT_TIMEOUT_MS", 2000)
+MONGO_SOCKET_TIMEOUT_MS = _env_int("MONGODB_SOCKET_TIMEOUT_MS", 5000)
+MONGO_SERVER_SELECTION_TIMEOUT_MS = _env_int("MONGODB_SERVER_SELECTION_TIMEOUT_MS", 2000)
+MONGO_WAIT_QUEUE_TIMEOUT_MS = _env_int("MONGODB_WAIT_QUEUE_TIMEOUT_MS", 2000)
+MONGO_PING_INTERVAL_S = _env_int("MONGODB_PING_INTERVAL_S", 15)
+
+# Comma-separated wire compressors (e.g. "zstd,snappy"). Off by default: the
+# corresponding compression packages are optional installs, and the server
+# must negotiate support. Worth enabling for large list responses.
+MONGO_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS", "")
+
+# Process-wide singleton client/collection. PyMongo's MongoClient is thread-safe
+# and manages its own connection pool, so one instance per process is the
+# recommended usage; creating a client per request pays a fresh TCP handshake
+# and topology discovery every time.
+_CLIENT = None
+_COLLECTION = None
+
+# Set once the unique index on "name" has been ensured for this process, so
+# the createIndexes round-trip is not repeated on every collection access.
+_INDEX_READY = False
+
+
+# PUBLIC_INTERFACE
+def get_mongo_collection():
+    """
+    Return the devices collection backed by a lazily-initialized, process-wide
+    MongoClient. The client is created on first use (so tests can patch
+    pymongo.MongoClient before any request is served) and reused afterwards.
+    """
+    global _CLIENT, _COLLECTION, _INDEX_READY
+    if _COLLECTION is None:
+        settings = load_mongo_settings()
+        client_kwargs = {
+            "maxPoolSize": MONGO_MAX_POOL_SIZE,
+            "minPoolSize": MONGO_MIN_POOL_SIZE,
+            "maxConnecting": MONGO_MAX_CONNECTING,
+            "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+            "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+            "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            # Bound how long a request waits for a pooled connection during
+            # bursts instead of piling up behind a saturated pool.
+            "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "retryWrites": True,
+            "appname": "device-inventory",
+        }
+        if MONGO_COMPRESSORS:
+            client_kwargs["compressors"] = MONGO_COMPRESSORS
+        _CLIENT = pymongo.MongoClient(settings.uri, **client_kwargs)
+        _COLLECTION = _CLIENT[settings.database][settings.collection].with_options(
+            codec_options=CodecOptions(document_class=_NoIdDict)
+        )
+    if not _INDEX_READY:
+        # Device names are the natural key; the unique index both enforces
+        # that and keeps name lookups an index probe. create_index is a no-op
+        # server-side once the index exists.
+        _COLLECTION.create_index([("name", pymongo.ASCENDING)], unique=True, name="uniq_name")
+        _INDEX_READY = True
+    return _COLLECTION
+
+
+# Cached result of the background liveness ping. Readers (e.g. health checks)
+# consult these instead of issuing their own round-trip.
+_last_ping_ok = False
+_last_ping_ts = 0.0
+_ping_thread = None
+
+
+# PUBLIC_INTERFACE
+def ping_status():
+    """
+    Return (ok, age_seconds) for the most recent background ping. ok is False
+    until the first ping has completed; age is float('inf') in that case.
+    """
+    if _last_ping_ts == 0.0:
+        return False, float("inf")
+    return _last_ping_ok, time.monotonic() - _last_ping_ts
+
+
+def _do_ping():
+    """Ping Mongo over the shared client and refresh the cached result."""
+    global _last_ping_ok, _last_ping_ts
+    try:
+        get_mongo_collection().database.client.admin.command("ping")
+        _last_ping_ok = True
+    except Exception:
+        _last_ping_ok = False
+    _last_ping_ts = time.monotonic()
+    return _last_ping_ok
+
+
+# PUBLIC_INTERFACE
+def ping(max_age_s: float = 5.0):
+    """
+    Return whether Mongo is reachable, answering from the cached ping when it
+    is at most max_age_s seconds old. Callers on the request path (the health
+    endpoint) therefore cost a couple of attribute reads in the common case
+    and at most one round-trip over the shared pool otherwise — never a new
+    client.
+    """
+    ok, age = ping_status()
+    if age <= max_age_s:
+        return ok
+    return _do_ping()
+
+
+def _bg_ping():
+    while True:
+        _do_ping()
+        time.sleep(MONGO_PING_INTERVAL_S)
+
+
+# PUBLIC_INTERFACE
+def start_background_ping():
+    """
+    Start the daemon thread that periodically pings Mongo and caches the
+    result. Doing this off the request path keeps worker boot time constant
+    regardless of database latency; callers read ping_status() instead of
+    blocking on a round-trip. Safe to call more than once.
+    """
+    global _ping_thread
+    if _ping_thread is None or not _ping_thread.is_alive():
+        _ping_thread = threading.Thread(target=_bg_ping, name="mongo-ping", daemon=True)
+        _ping_thread.start()
+
+
+def _reset_client():
+    """
+    Drop the cached client/collection so the next get_mongo_collection() call
+    rebuilds them. Used by tests to swap in a fresh mock between cases.
+    """
+    global _CLIENT, _COLLECTION, _INDEX_READY
+    _CLIENT = None
+    _COLLECTION = None
+    _INDEX_READY = False
+
+
+# PUBLIC_INTERFACE
+def ensure_indexes():
+    """
+    Ensure the unique name index at application startup instead of on the
+    first request, so the first POST is never the one paying for (or racing)
+    index creation. A temporarily unreachable Mongo is logged and left for
+    the lazy per-request guard to retry; it must not fail worker boot.
+    """
+    try:
+        get_mongo_collection()
+    except Exception:
+        logger.warning("could not ensure Mongo indexes at startup; will retry lazily", exc_info=True)
+
+
+def _close_client():
+    """
+    Close the singleton client at process shutdown. Per-request close() calls
+    would defeat the shared pool; this is the only place teardown belongs.
+    """
+    global _CLIENT, _COLLECTION
+    if _CLIENT is not None:
+        _CLIENT.close()
+        _CLIENT = None
+        _COLLECTION = None
+
+
+atexit.register(_close_client)
+
+
+# A MongoClient must not be shared across fork boundaries (its sockets and
+# monitor threads belong to the parent). Under pre-forking servers such as
+# gunicorn with --preload, drop the inherited singleton so each child lazily
+# builds its own client/pool on first use.
+if hasattr(os, "register_at_fork"):  # pragma: no branch - always true on POSIX
+    os.register_at_fork(after_in_child=_reset_client)
@@ -0,0 +1,31 @@
+import functools
+
+import orjson
+from flask import Response
+
+
+# Messages shared by routes and the app-level handlers. Module-level
+# constants keep the hot error paths free of per-request string building.
+INTERNAL_SERVER_ERROR = "Internal server error"
+
+
+@functools.lru_cache(maxsize=64)
+def _error_body(code: int, message: str) -> bytes:
+    """
+    Encoded error payload for a (code, message) pair. Error messages are a
+    small fixed vocabulary, so the JSON encode for each is paid once per
+    process; the cache is bounded in case attacker-influenced validation
+    messages vary.
+    """
+    return orjson.dumps({"error": {"code": str(code), "message": message}})
+
+
+# PUBLIC_INTERFACE
+def error_response(code: int, message: str):
+    """
+    Standardized JSON error response body and status code:
+    {"error": {"code": "<status_code>", "message": "<description>"}}
+    Shared by route handlers and the app-level error handlers so every error
+    leaves the API in the same shape.
+    """
+    return Response(_error_body(code, message), status=code, mimetype="application/json")
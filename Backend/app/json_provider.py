@@ -0,0 +1,18 @@
+import orjson
+from flask.json.provider import JSONProvider
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson (C-implemented encoder/decoder).
+    Routes every jsonify()/get_json() call through orjson, which is several
+    times faster than the stdlib json module, most noticeably on the device
+    list responses.
+    """
+
+    def dumps(self, obj, **kwargs):
+        # Flask's provider contract expects str; orjson emits bytes.
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
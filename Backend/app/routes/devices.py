@@ -1,9 +1,18 @@
-from flask import request, jsonify
+import hashlib
+import threading
+import time
+import uuid
+
+import orjson
+from flask import request, jsonify, Response, stream_with_context
 from flask_smorest import Blueprint
-from flask.views import MethodView
-from pymongo import MongoClient
-import os
-from typing import Dict, Any, List
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from typing import List
+
+from ..db import get_mongo_collection
+from ..errors import error_response
+from ..schemas import DEVICE_CREATE_SCHEMA, DEVICE_UPDATE_SCHEMA
 
 # Initialize blueprint for Devices routes
 blp_devices = Blueprint(
@@ -13,80 +22,213 @@ blp_devices = Blueprint(
     description="Device inventory management operations",
 )
 
-# Environment variables for MongoDB configuration
-# Note: These should be provided via .env in deployment. Sensible defaults provided for local dev/tests.
-MONGO_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-MONGO_DB = os.getenv("MONGODB_DB", "device_inventory")
-MONGO_COLLECTION = os.getenv("MONGODB_COLLECTION", "devices")
+
+# Static error messages used on the request paths, built once at import
+# instead of per request (and hitting the pre-encoded body cache in
+# app.errors on every reuse).
+_MSG_INVALID_JSON = "Invalid JSON body"
+_MSG_NOT_FOUND = "Device not found"
+_MSG_NAME_CONFLICT = "Device name already exists"
+_MSG_BULK_BODY = "Request body must be a non-empty JSON array of devices"
+_MSG_BULK_CONFLICT = "One or more device names already exist"
+
+# Documents fetched per getMore while streaming the device list; bounds the
+# amount of decoded BSON held in memory at any point.
+_LIST_BATCH_SIZE = 500
+
+# Short-TTL cache for device detail reads: inventory traffic is read-heavy
+# with rare writes, so repeated GETs of a hot device are served from process
+# memory instead of a Mongo round-trip. Writes invalidate the affected name,
+# so the TTL only bounds staleness across processes.
+_CACHE_TTL_S = 5.0
+_CACHE_MAX = 10_000
+_device_cache = {}
+_device_cache_lock = threading.Lock()
+
+
+def _cache_get(name):
+    """Return the cached document for name, or None if absent or expired."""
+    now = time.monotonic()
+    with _device_cache_lock:
+        entry = _device_cache.get(name)
+        if entry is None:
+            return None
+        if entry[0] < now:
+            del _device_cache[name]
+            return None
+        return entry[1]
+
+
+def _cache_put(name, doc):
+    with _device_cache_lock:
+        if len(_device_cache) >= _CACHE_MAX:
+            _device_cache.clear()
+        _device_cache[name] = (time.monotonic() + _CACHE_TTL_S, doc)
+
+
+def _cache_invalidate(name=None):
+    """
+    Drop one cached device, or everything when no name is given. Every write
+    path lands here, so it doubles as the bump point for the list ETag
+    version.
+    """
+    global _list_version
+    with _device_cache_lock:
+        _list_version += 1
+        if name is None:
+            _device_cache.clear()
+        else:
+            _device_cache.pop(name, None)
 
 
 def _get_collection():
     """
-    Internal helper to access the MongoDB collection using pymongo.
-    Tests patch pymongo.MongoClient, so this indirection is important.
+    Internal helper to access the MongoDB collection.
+    Delegates to the process-wide singleton client in app.db; tests patch
+    pymongo.MongoClient and reset the singleton between cases.
     """
-    client = MongoClient(MONGO_URI)
-    db = client[MONGO_DB]
-    collection = db[MONGO_COLLECTION]
-    return collection
+    return get_mongo_collection()
 
 
-def _error(code: int, message: str):
+def _stream_devices(cursor):
     """
-    Standardized JSON error response body and status code.
-    The tests accept either {"error": "msg"} or {"error": {"message": "..."}}
-    We choose the latter for richer structure.
+    Yield a JSON array of device documents incrementally from a cursor, so the
+    response needs O(1) memory instead of materializing the full list and the
+    first byte goes out after the first document instead of the last.
     """
-    payload = {"error": {"code": str(code), "message": message}}
-    return jsonify(payload), code
+    try:
+        yield b"["
+        first = True
+        for doc in cursor:
+            if first:
+                first = False
+            else:
+                yield b","
+            yield orjson.dumps(doc)
+        yield b"]"
+    finally:
+        close = getattr(cursor, "close", None)
+        if close is not None:
+            close()
 
 
-def _validate_device_create(payload: Dict[str, Any]) -> List[str]:
+# ETag state for conditional GETs. Detail ETags hash the encoded document;
+# the list ETag is cheaper: a per-process random seed plus a version counter
+# bumped on every write, with a time bucket mixed in so writes from other
+# processes can only be masked for as long as the detail cache already
+# tolerates (_CACHE_TTL_S).
+_LIST_ETAG_SEED = uuid.uuid4().hex[:8]
+_list_version = 0
+
+
+def _body_etag(body: bytes) -> str:
     """
-    Validate the payload for creating a device.
-    Required: name, ip_address, type, location
-    type must be one of Router|Switch|Server
+    ETag for an encoded response body. ETags only need change-detection, not
+    collision resistance, so a short blake2b digest buys back the hashing CPU
+    a cryptographic-strength sha256 would spend on every detail read (and a
+    16-char tag instead of 64 on the wire).
     """
-    errors: List[str] = []
-    required = ["name", "ip_address", "type", "location"]
-    for field in required:
-        if field not in payload or payload.get(field) in (None, ""):
-            errors.append(f"Missing required field: {field}")
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def _list_etag():
+    """
+    ETag for the unfiltered device list, or None when query parameters make
+    the response request-specific.
+    """
+    if request.args:
+        return None
+    bucket = int(time.monotonic() / _CACHE_TTL_S)
+    return f"{_LIST_ETAG_SEED}-{_list_version}-{bucket}"
+
 
-    allowed_types = {"Router", "Switch", "Server"}
-    if "type" in payload and payload.get("type") not in allowed_types:
-        errors.append("Field 'type' must be one of: Router, Switch, Server")
-    return errors
+def _not_modified(etag: str):
+    resp = Response(status=304)
+    resp.set_etag(etag)
+    return resp
 
 
-def _validate_device_update(payload: Dict[str, Any]) -> List[str]:
+# Fields a client may select via ?fields=; everything else is ignored.
+_DEVICE_FIELDS = frozenset(("name", "ip_address", "type", "location"))
+
+
+def _requested_projection():
     """
-    Validate the payload for updating a device.
-    Required: ip_address, type, location
+    Build a Mongo projection from the optional ?fields=name,type query
+    parameter so narrowed reads ship fewer bytes and decode fewer values.
+    Unknown field names are dropped and _id stays excluded; without a usable
+    parameter the default exclude-_id projection is returned.
     """
-    errors: List[str] = []
-    required = ["ip_address", "type", "location"]
-    for field in required:
-        if field not in payload or payload.get(field) in (None, ""):
-            errors.append(f"Missing required field: {field}")
+    raw = request.args.get("fields")
+    if not raw:
+        return {"_id": 0}
+    projection = {field: 1 for field in raw.split(",") if field in _DEVICE_FIELDS}
+    if not projection:
+        return {"_id": 0}
+    projection["_id"] = 0
+    return projection
+
 
-    allowed_types = {"Router", "Switch", "Server"}
-    if "type" in payload and payload.get("type") not in allowed_types:
-        errors.append("Field 'type' must be one of: Router, Switch, Server")
-    return errors
+def _json_body():
+    """
+    Decode the request body with orjson, bypassing Werkzeug's stdlib-based
+    JSON machinery (and its content-type negotiation) on the hot path.
+    Returns None for a missing or malformed body so handlers can answer with
+    a cheap 400 instead of running every field of an empty dict through
+    validation.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return None
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
 
 
-# PUBLIC_INTERFACE
-@blp_devices.route("/")
-class DevicesList(MethodView):
+def _schema_errors(schema, payload) -> List[str]:
     """
-    List and create devices.
+    Run a marshmallow schema over the payload and flatten its error mapping
+    into the "field: message" strings used by the 400 responses.
+    """
+    errors = schema.validate(payload)
+    return [f"{field}: {', '.join(str(m) for m in msgs)}" for field, msgs in errors.items()]
+
 
+# PUBLIC_INTERFACE
+@blp_devices.route("/", methods=["GET"])
+@blp_devices.response(200, description="A list of devices")
+@blp_devices.doc(summary="List all devices", description="Return all devices in the inventory")
+def list_devices():
+    """
     GET /devices
       - Returns list of all devices.
       - 200: [Device]
       - 500: error response
+    """
+    etag = _list_etag()
+    if etag is not None and request.if_none_match.contains(etag):
+        return _not_modified(etag)
+
+    coll = _get_collection()
+    # _id is projected out server-side, so the decoded documents are
+    # JSON-ready; stream them instead of buffering the whole list.
+    cursor = coll.find({}, _requested_projection(), batch_size=_LIST_BATCH_SIZE)
+    resp = Response(
+        stream_with_context(_stream_devices(cursor)),
+        mimetype="application/json",
+    )
+    if etag is not None:
+        resp.set_etag(etag)
+    return resp
+
 
+# PUBLIC_INTERFACE
+@blp_devices.route("/", methods=["POST"])
+@blp_devices.response(201, description="Device created successfully")
+@blp_devices.doc(summary="Add a new device", description="Create a new device with unique name")
+def create_device():
+    """
     POST /devices
       - Creates a new device; enforces unique 'name'.
       - 201: created Device
@@ -94,130 +236,182 @@ class DevicesList(MethodView):
       - 409: conflict if device with same name exists
       - 500: error response
     """
+    payload = _json_body()
+    if not isinstance(payload, dict):
+        return error_response(400, _MSG_INVALID_JSON)
+    errors = _schema_errors(DEVICE_CREATE_SCHEMA, payload)
+    if errors:
+        return error_response(400, "; ".join(errors))
 
-    @blp_devices.response(200, description="A list of devices")
-    @blp_devices.doc(summary="List all devices", description="Return all devices in the inventory")
-    def get(self):
-        try:
-            coll = _get_collection()
-            devices = list(coll.find())
-            # Convert Mongo documents to plain JSON-friendly dicts (remove _id)
-            normalized = []
-            for d in devices:
-                d.pop("_id", None)
-                normalized.append(d)
-            return jsonify(normalized), 200
-        except Exception as exc:  # pragma: no cover - covered via tests as 500
-            return _error(500, f"Internal server error: {str(exc)}")
-
-    @blp_devices.response(201, description="Device created successfully")
-    @blp_devices.doc(summary="Add a new device", description="Create a new device with unique name")
-    def post(self):
-        try:
-            payload = request.get_json(silent=True) or {}
-            errors = _validate_device_create(payload)
-            if errors:
-                return _error(400, "; ".join(errors))
-
-            coll = _get_collection()
-            existing = coll.find_one({"name": payload["name"]})
-            if existing:
-                return _error(409, "Device name already exists")
-
-            # Insert and echo back the created device (without Mongo _id)
-            coll.insert_one({
-                "name": payload["name"],
-                "ip_address": payload["ip_address"],
-                "type": payload["type"],
-                "location": payload["location"],
-            })
-            created = {
-                "name": payload["name"],
-                "ip_address": payload["ip_address"],
-                "type": payload["type"],
-                "location": payload["location"],
-            }
-            return jsonify(created), 201
-        except Exception as exc:  # pragma: no cover
-            return _error(500, f"Internal server error: {str(exc)}")
+    coll = _get_collection()
+    doc = {
+        "name": payload["name"],
+        "ip_address": payload["ip_address"],
+        "type": payload["type"],
+        "location": payload["location"],
+    }
+    # Create-or-conflict as one atomic upsert: $setOnInsert writes the
+    # document only when no device with this name exists, and a missing
+    # upserted_id means it already did. One round-trip, no TOCTOU race,
+    # no exception on the conflict path, and the validated doc doubles
+    # as the echo so there is no read-back either.
+    result = coll.update_one({"name": doc["name"]}, {"$setOnInsert": doc}, upsert=True)
+    if result.upserted_id is None:
+        return error_response(409, _MSG_NAME_CONFLICT)
+    _cache_invalidate(doc["name"])
+    return jsonify(doc), 201
 
 
 # PUBLIC_INTERFACE
-@blp_devices.route("/<string:name>")
-class DeviceDetail(MethodView):
+@blp_devices.route("/bulk", methods=["POST"])
+@blp_devices.response(201, description="Devices created successfully")
+@blp_devices.doc(summary="Add devices in bulk", description="Create many devices in a single insert")
+def bulk_create_devices():
+    """
+    POST /devices/bulk
+      - Accepts a JSON array of devices (bare, or wrapped as
+    {"devices": [...]}) and inserts them in one round-trip via
+    insert_many(ordered=False) instead of N single inserts.
+      - 201: {"created": N}
+      - 400: validation error (any invalid item rejects the whole batch)
+      - 409: one or more device names already exist
+      - 500: error response
     """
-    Retrieve, update, and delete a device by name.
+    payload = _json_body()
+    if isinstance(payload, dict):
+        payload = payload.get("devices")
+    if not isinstance(payload, list) or not payload:
+        return error_response(400, _MSG_BULK_BODY)
+
+    # One many=True pass over the batch instead of a per-item call.
+    batch_errors = DEVICE_CREATE_SCHEMA.validate(payload, many=True)
+    if batch_errors:
+        errors = [
+            f"[{idx}] " + "; ".join(
+                f"{field}: {', '.join(str(m) for m in msgs)}"
+                for field, msgs in item_errors.items()
+            )
+            for idx, item_errors in sorted(batch_errors.items())
+        ]
+        return error_response(400, "; ".join(errors))
+
+    docs = [
+        {
+            "name": p["name"],
+            "ip_address": p["ip_address"],
+            "type": p["type"],
+            "location": p["location"],
+        }
+        for p in payload
+    ]
+    coll = _get_collection()
+    try:
+        # ordered=False lets the server keep inserting past duplicate
+        # names, so one bad row does not waste the whole round-trip.
+        result = coll.insert_many(docs, ordered=False)
+    except BulkWriteError as exc:
+        details = exc.details or {}
+        failed = [str(err.get("index")) for err in details.get("writeErrors", [])]
+        return error_response(
+            409,
+            "Device name already exists at index(es): " + ", ".join(failed)
+            if failed
+            else _MSG_BULK_CONFLICT,
+        )
+    for d in docs:
+        _cache_invalidate(d["name"])
+    return jsonify({"created": len(result.inserted_ids)}), 201
 
+
+# PUBLIC_INTERFACE
+@blp_devices.route("/<string:name>", methods=["GET"])
+@blp_devices.response(200, description="Device details")
+@blp_devices.doc(summary="Retrieve device details by name")
+def get_device(name: str):
+    """
     GET /devices/{name}
       - 200: Device
       - 404: Not found
       - 500: Error
+    """
+    # Field-limited reads bypass the cache, which stores full documents.
+    projection = _requested_projection()
+    full_read = projection == {"_id": 0}
+    doc = _cache_get(name) if full_read else None
+    if doc is None:
+        coll = _get_collection()
+        # Project _id out server-side: less BSON over the wire and the
+        # document is JSON-ready as decoded.
+        doc = coll.find_one({"name": name}, projection)
+        if not doc:
+            return error_response(404, _MSG_NOT_FOUND)
+        if full_read:
+            _cache_put(name, doc)
+    # Conditional GET: polling clients holding the current ETag get a
+    # body-less 304 instead of re-downloading an unchanged document.
+    body = orjson.dumps(doc)
+    etag = _body_etag(body)
+    if request.if_none_match.contains(etag):
+        return _not_modified(etag)
+    resp = Response(body, mimetype="application/json")
+    resp.set_etag(etag)
+    return resp
 
+
+# PUBLIC_INTERFACE
+@blp_devices.route("/<string:name>", methods=["PUT"])
+@blp_devices.response(200, description="Device updated successfully")
+@blp_devices.doc(summary="Update device attributes (except name)")
+def update_device(name: str):
+    """
     PUT /devices/{name}
       - 200: Updated Device
       - 400: Validation error
       - 404: Not found
       - 500: Error
+    """
+    payload = _json_body()
+    if not isinstance(payload, dict):
+        return error_response(400, _MSG_INVALID_JSON)
+    errors = _schema_errors(DEVICE_UPDATE_SCHEMA, payload)
+    if errors:
+        return error_response(400, "; ".join(errors))
+
+    coll = _get_collection()
+    update_fields = {
+        "ip_address": payload["ip_address"],
+        "type": payload["type"],
+        "location": payload["location"],
+    }
+    # Atomic find+update in one round-trip; the AFTER image is the
+    # response body, so no local reconstruction is needed.
+    updated = coll.find_one_and_update(
+        {"name": name},
+        {"$set": update_fields},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    if updated is None:
+        return error_response(404, _MSG_NOT_FOUND)
+    _cache_invalidate(name)
+    return jsonify(updated), 200
+
 
+# PUBLIC_INTERFACE
+@blp_devices.route("/<string:name>", methods=["DELETE"])
+@blp_devices.response(204, description="Device deleted successfully")
+@blp_devices.doc(summary="Remove a device")
+def delete_device(name: str):
+    """
     DELETE /devices/{name}
       - 204: Deleted successfully (or 200 in some variants)
       - 404: Not found
       - 500: Error
     """
-
-    @blp_devices.response(200, description="Device details")
-    @blp_devices.doc(summary="Retrieve device details by name")
-    def get(self, name: str):
-        try:
-            coll = _get_collection()
-            doc = coll.find_one({"name": name})
-            if not doc:
-                return _error(404, "Device not found")
-            doc.pop("_id", None)
-            return jsonify(doc), 200
-        except Exception as exc:  # pragma: no cover
-            return _error(500, f"Internal server error: {str(exc)}")
-
-    @blp_devices.response(200, description="Device updated successfully")
-    @blp_devices.doc(summary="Update device attributes (except name)")
-    def put(self, name: str):
-        try:
-            payload = request.get_json(silent=True) or {}
-            errors = _validate_device_update(payload)
-            if errors:
-                return _error(400, "; ".join(errors))
-
-            coll = _get_collection()
-            existing = coll.find_one({"name": name})
-            if not existing:
-                return _error(404, "Device not found")
-
-            update_fields = {
-                "ip_address": payload["ip_address"],
-                "type": payload["type"],
-                "location": payload["location"],
-            }
-            coll.update_one({"name": name}, {"$set": update_fields})
-            updated = {
-                "name": name,
-                **update_fields,
-            }
-            return jsonify(updated), 200
-        except Exception as exc:  # pragma: no cover
-            return _error(500, f"Internal server error: {str(exc)}")
-
-    @blp_devices.response(204, description="Device deleted successfully")
-    @blp_devices.doc(summary="Remove a device")
-    def delete(self, name: str):
-        try:
-            coll = _get_collection()
-            existing = coll.find_one({"name": name})
-            if not existing:
-                return _error(404, "Device not found")
-            res = coll.delete_one({"name": name})
-            # Return 204 if a document was deleted, otherwise 404 already covered
-            if getattr(res, "deleted_count", 0) > 0:
-                return "", 204
-            return _error(404, "Device not found")
-        except Exception as exc:  # pragma: no cover
-            return _error(500, f"Internal server error: {str(exc)}")
+    coll = _get_collection()
+    # Atomic find+delete in one round-trip.
+    deleted = coll.find_one_and_delete({"name": name}, projection={"_id": 0})
+    if deleted is None:
+        return error_response(404, _MSG_NOT_FOUND)
+    _cache_invalidate(name)
+    return "", 204
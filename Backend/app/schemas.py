@@ -0,0 +1,34 @@
+from marshmallow import EXCLUDE, Schema, fields, validate
+
+# Device categories accepted by the inventory.
+DEVICE_TYPES = ("Router", "Switch", "Server")
+
+
+class DeviceCreateSchema(Schema):
+    """Payload for creating a device; name is the unique key."""
+
+    class Meta:
+        unknown = EXCLUDE
+
+    name = fields.Str(required=True, validate=validate.Length(min=1))
+    ip_address = fields.IP(required=True)
+    type = fields.Str(required=True, validate=validate.OneOf(DEVICE_TYPES))
+    location = fields.Str(required=True, validate=validate.Length(min=1))
+
+
+class DeviceUpdateSchema(Schema):
+    """Payload for updating a device: every attribute except the name key."""
+
+    class Meta:
+        unknown = EXCLUDE
+
+    ip_address = fields.IP(required=True)
+    type = fields.Str(required=True, validate=validate.OneOf(DEVICE_TYPES))
+    location = fields.Str(required=True, validate=validate.Length(min=1))
+
+
+# Shared, thread-safe instances: constructing a Schema walks every field
+# descriptor and is far more expensive than the validation itself, so build
+# each one once per process instead of per request.
+DEVICE_CREATE_SCHEMA = DeviceCreateSchema()
+DEVICE_UPDATE_SCHEMA = DeviceUpdateSchema()
@@ -48,13 +48,13 @@ def sample_device_update():
     }
 
 
-@pytest.fixture()
-def mock_pymongo():
+@pytest.fixture(scope="session")
+def _pymongo_mocks():
     """
-    Mock pymongo to avoid any real database interaction.
-    This returns a structure resembling client[db][collection].
+    Build the MagicMock client/db/collection structure and patch
+    pymongo.MongoClient once for the whole session; starting and stopping the
+    patches in every test dominated fixture setup time as the suite grew.
     """
-    # Create nested MagicMocks to emulate pymongo usage
     mock_collection = MagicMock()
     mock_db = MagicMock()
     mock_client = MagicMock()
@@ -63,14 +63,6 @@ def mock_pymongo():
     mock_db.__getitem__.return_value = mock_collection
     mock_client.__getitem__.return_value = mock_db
 
-    # Example default behaviors (can be overridden in individual tests)
-    mock_collection.find.return_value = []
-    mock_collection.insert_one.return_value = types.SimpleNamespace(inserted_id="fakeid")
-    mock_collection.find_one.return_value = None
-    mock_collection.update_one.return_value = types.SimpleNamespace(matched_count=0, modified_count=0)
-    mock_collection.delete_one.return_value = types.SimpleNamespace(deleted_count=0)
-
-    # Patch points: typical import paths
     patches = [
         patch("pymongo.MongoClient", return_value=mock_client),
         patch("app.routes", create=True),  # in case code accesses app.routes level modules
@@ -87,3 +79,41 @@ def mock_pymongo():
 
     for p in patches:
         p.stop()
+    from app import db as app_db
+    app_db._reset_client()
+
+
+@pytest.fixture()
+def mock_pymongo(_pymongo_mocks):
+    """
+    Per-test view of the session-scoped mocks: clears call history and
+    side effects, re-applies the default behaviors, and resets the app-side
+    singletons and caches so no state leaks between cases.
+    """
+    mock_collection = _pymongo_mocks["collection"]
+    mock_collection.reset_mock(return_value=True, side_effect=True)
+
+    # app.db rebinds the collection through with_options (codec options);
+    # route the call back to the same mock so test stubs keep applying.
+    mock_collection.with_options.return_value = mock_collection
+
+    # Example default behaviors (can be overridden in individual tests)
+    mock_collection.find.return_value = []
+    mock_collection.insert_one.return_value = types.SimpleNamespace(inserted_id="fakeid")
+    mock_collection.find_one.return_value = None
+    mock_collection.find_one_and_update.return_value = None
+    mock_collection.find_one_and_delete.return_value = None
+    mock_collection.update_one.return_value = types.SimpleNamespace(
+        matched_count=0, modified_count=0, upserted_id=None
+    )
+    mock_collection.delete_one.return_value = types.SimpleNamespace(deleted_count=0)
+
+    # Drop the cached singleton so the first _get_collection() call in each
+    # test builds from the patched MongoClient above, and clear the in-process
+    # device cache so no test observes another test's reads.
+    from app import db as app_db
+    from app.routes import devices as devices_module
+    app_db._reset_client()
+    devices_module._cache_invalidate()
+
+    return _pymongo_mocks
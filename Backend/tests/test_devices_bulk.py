@@ -0,0 +1,63 @@
+import types
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from .utils import is_error_response
+
+pytestmark = [pytest.mark.devices]
+
+
+def test_bulk_create_success(client, mock_pymongo, sample_device):
+    second = dict(sample_device, name="switch-01", type="Switch")
+    mock_pymongo["collection"].insert_many.return_value = types.SimpleNamespace(
+        inserted_ids=["id1", "id2"]
+    )
+
+    resp = client.post("/devices/bulk", json=[sample_device, second])
+
+    assert resp.status_code == 201
+    assert resp.get_json() == {"created": 2}
+    args, kwargs = mock_pymongo["collection"].insert_many.call_args
+    assert len(args[0]) == 2
+    assert kwargs.get("ordered") is False
+
+
+def test_bulk_create_accepts_wrapped_payload(client, mock_pymongo, sample_device):
+    mock_pymongo["collection"].insert_many.return_value = types.SimpleNamespace(
+        inserted_ids=["id1"]
+    )
+
+    resp = client.post("/devices/bulk", json={"devices": [sample_device]})
+
+    assert resp.status_code == 201
+    assert resp.get_json() == {"created": 1}
+
+
+def test_bulk_create_validation_error(client, mock_pymongo, sample_device):
+    bad = dict(sample_device)
+    bad.pop("ip_address")
+
+    resp = client.post("/devices/bulk", json=[sample_device, bad])
+
+    assert resp.status_code == 400
+    assert is_error_response(resp.get_json())
+    mock_pymongo["collection"].insert_many.assert_not_called()
+
+
+def test_bulk_create_rejects_non_array_body(client, mock_pymongo, sample_device):
+    resp = client.post("/devices/bulk", json=sample_device)
+
+    assert resp.status_code == 400
+    assert is_error_response(resp.get_json())
+
+
+def test_bulk_create_conflict(client, mock_pymongo, sample_device):
+    mock_pymongo["collection"].insert_many.side_effect = BulkWriteError(
+        {"writeErrors": [{"index": 1, "code": 11000}], "nInserted": 1}
+    )
+
+    resp = client.post("/devices/bulk", json=[sample_device, dict(sample_device)])
+
+    assert resp.status_code == 409
+    assert is_error_response(resp.get_json())
@@ -1,3 +1,5 @@
+import types
+
 import pytest
 from .utils import is_error_response
 
@@ -5,7 +7,10 @@ pytestmark = [pytest.mark.devices]
 
 
 def test_create_device_success(client, mock_pymongo, sample_device):
-    mock_pymongo["collection"].find_one.return_value = None  # no existing
+    # The upsert reports a fresh document via upserted_id
+    mock_pymongo["collection"].update_one.return_value = types.SimpleNamespace(
+        matched_count=0, modified_count=0, upserted_id="fakeid"
+    )
     resp = client.post("/devices", json=sample_device)
 
     assert resp.status_code == 201
@@ -30,9 +35,8 @@ def test_create_device_validation_error(client, mock_pymongo, sample_device):
 
 @pytest.mark.xfail(reason="Endpoint /devices not implemented yet", raises=AssertionError, strict=False)
 def test_create_device_conflict(client, mock_pymongo, sample_device):
-    # pretend a device with same name exists
-    mock_pymongo["collection"].find_one.return_value = sample_device
-
+    # pretend a device with same name exists: the upsert matches instead of
+    # inserting, so no upserted_id comes back (conftest default)
     resp = client.post("/devices", json=sample_device)
 
     assert resp.status_code == 409
@@ -45,7 +49,7 @@ def test_create_device_internal_error(client, mock_pymongo, sample_device, monke
     def boom(*args, **kwargs):
         raise RuntimeError("unexpected")
 
-    mock_pymongo["collection"].insert_one.side_effect = boom
+    mock_pymongo["collection"].update_one.side_effect = boom
 
     resp = client.post("/devices", json=sample_device)
 
@@ -1,4 +1,6 @@
 import pytest
+from pymongo import ReturnDocument
+
 from .utils import is_error_response
 
 pytestmark = [pytest.mark.devices]
@@ -13,6 +15,20 @@ def test_get_device_success(client, mock_pymongo, sample_device):
     assert data["name"] == sample_device["name"]
 
 
+def test_get_device_etag_304(client, mock_pymongo, sample_device):
+    mock_pymongo["collection"].find_one.return_value = sample_device
+    first = client.get(f"/devices/{sample_device['name']}")
+    assert first.status_code == 200
+    etag = first.headers.get("ETag")
+    assert etag
+
+    again = client.get(
+        f"/devices/{sample_device['name']}", headers={"If-None-Match": etag}
+    )
+    assert again.status_code == 304
+    assert again.data == b""
+
+
 def test_get_device_not_found(client, mock_pymongo):
     mock_pymongo["collection"].find_one.return_value = None
     resp = client.get("/devices/unknown")
@@ -34,13 +50,19 @@ def test_get_device_internal_error(client, mock_pymongo):
 
 # PUT /devices/{name}
 def test_update_device_success(client, mock_pymongo, sample_device, sample_device_update):
-    mock_pymongo["collection"].find_one.return_value = sample_device
-    mock_pymongo["collection"].update_one.return_value = type("R", (), {"matched_count": 1, "modified_count": 1})
+    mock_pymongo["collection"].find_one_and_update.return_value = {
+        "name": sample_device["name"],
+        **sample_device_update,
+    }
     resp = client.put(f"/devices/{sample_device['name']}", json=sample_device_update)
     assert resp.status_code == 200
     data = resp.get_json()
     assert data["ip_address"] == sample_device_update["ip_address"]
     assert data["location"] == sample_device_update["location"]
+    # The update must stay a single atomic round-trip returning the AFTER image.
+    _, kwargs = mock_pymongo["collection"].find_one_and_update.call_args
+    assert kwargs.get("return_document") == ReturnDocument.AFTER
+    assert kwargs.get("projection") == {"_id": 0}
 
 
 def test_update_device_validation_error(client, mock_pymongo, sample_device):
@@ -53,7 +75,7 @@ def test_update_device_validation_error(client, mock_pymongo, sample_device):
 
 
 def test_update_device_not_found(client, mock_pymongo, sample_device_update):
-    mock_pymongo["collection"].find_one.return_value = None
+    mock_pymongo["collection"].find_one_and_update.return_value = None
     resp = client.put("/devices/unknown", json=sample_device_update)
     assert resp.status_code == 404
     data = resp.get_json()
@@ -64,7 +86,7 @@ def test_update_device_internal_error(client, mock_pymongo, sample_device_update
     def boom(*args, **kwargs):
         raise RuntimeError("unexpected")
 
-    mock_pymongo["collection"].update_one.side_effect = boom
+    mock_pymongo["collection"].find_one_and_update.side_effect = boom
     resp = client.put("/devices/router-01", json=sample_device_update)
     assert resp.status_code == 500
     data = resp.get_json()
@@ -73,15 +95,14 @@ def test_update_device_internal_error(client, mock_pymongo, sample_device_update
 
 # DELETE /devices/{name}
 def test_delete_device_success(client, mock_pymongo, sample_device):
-    mock_pymongo["collection"].find_one.return_value = sample_device
-    mock_pymongo["collection"].delete_one.return_value = type("R", (), {"deleted_count": 1})
+    mock_pymongo["collection"].find_one_and_delete.return_value = sample_device
     resp = client.delete(f"/devices/{sample_device['name']}")
     # Spec alternates between 200 and 204 in variants; using 204 per subtask ask.
     assert resp.status_code in (200, 204)
 
 
 def test_delete_device_not_found(client, mock_pymongo):
-    mock_pymongo["collection"].find_one.return_value = None
+    mock_pymongo["collection"].find_one_and_delete.return_value = None
     resp = client.delete("/devices/unknown")
     assert resp.status_code == 404
     data = resp.get_json()
@@ -92,7 +113,7 @@ def test_delete_device_internal_error(client, mock_pymongo):
     def boom(*args, **kwargs):
         raise RuntimeError("unexpected")
 
-    mock_pymongo["collection"].delete_one.side_effect = boom
+    mock_pymongo["collection"].find_one_and_delete.side_effect = boom
     resp = client.delete("/devices/router-01")
     assert resp.status_code == 500
     data = resp.get_json()
@@ -34,6 +34,31 @@ def test_list_devices_success(client, mock_pymongo):
     )
 
 
+def test_list_devices_fields_projection(client, mock_pymongo):
+    mock_pymongo["collection"].find.return_value = [
+        {"name": "router-01", "type": "Router"},
+    ]
+
+    resp = client.get("/devices?fields=name,type,bogus")
+
+    assert resp.status_code == 200
+    args, _ = mock_pymongo["collection"].find.call_args
+    # Unknown fields are dropped; _id stays excluded.
+    assert args[1] == {"name": 1, "type": 1, "_id": 0}
+
+
+def test_list_devices_etag_304(client, mock_pymongo):
+    mock_pymongo["collection"].find.return_value = []
+    first = client.get("/devices")
+    assert first.status_code == 200
+    etag = first.headers.get("ETag")
+    assert etag
+
+    again = client.get("/devices", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+
 def test_list_devices_internal_error(client, mock_pymongo, monkeypatch):
     # Force an unexpected error in find()
     def boom(*args, **kwargs):